@@ -1,6 +1,20 @@
 import bpy
+import heapq
 import math
 import os
+import shutil
+import struct
+import subprocess
+import tempfile
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack, contextmanager
+from functools import lru_cache
+from itertools import groupby
+from multiprocessing.pool import ThreadPool
+
+import numpy as np
+from mathutils import Euler, Quaternion
 
 # ========================================================
 # PROPERTY GROUP
@@ -30,18 +44,78 @@ class RenderProps(bpy.types.PropertyGroup):
         default="//post/",
         subtype="DIR_PATH"
     )
+    num_workers: bpy.props.IntProperty(
+        name="Workers",
+        description="Headless Blender processes to render with, one GPU each",
+        default=1,
+        min=1,
+        max=16
+    )
+    preview_mode: bpy.props.BoolProperty(
+        name="Preview Mode",
+        description="Render the batch with Workbench at 25% resolution",
+        default=False
+    )
+    reuse_identical: bpy.props.BoolProperty(
+        name="Reuse Identical Renders",
+        description=(
+            "Copy the images of keyframes that pose the object the same "
+            "way instead of rendering them again. Only the object's own "
+            "keyed channels are compared, not materials"
+        ),
+        default=False
+    )
+    reuse_symmetric: bpy.props.BoolProperty(
+        name="Reuse Symmetric Turns",
+        description=(
+            "Copy the images of turns that map a Z-symmetric mesh onto "
+            "itself instead of rendering them again. Only vertex "
+            "positions are compared, not materials or UVs"
+        ),
+        default=False
+    )
+
+# ========================================================
+# TEMPORARY OVERRIDES
+# --------------------------------------------------------
+# Sets attributes on a Blender struct for the duration
+# of a render batch and restores the old values after.
+# ========================================================
+@contextmanager
+def override_attrs(target, **values):
+    saved = {name: getattr(target, name) for name in values}
+    for name, value in values.items():
+        setattr(target, name, value)
+    try:
+        yield
+    finally:
+        for name, value in saved.items():
+            setattr(target, name, value)
+
+def viewport_overlays():
+    for window in bpy.context.window_manager.windows:
+        for area in window.screen.areas:
+            if area.type == "VIEW_3D":
+                yield area.spaces.active.overlay
 
 # ========================================================
 # COMPOSITOR SETUP
 # --------------------------------------------------------
 # Creates (or reuses) a compositor graph:
 # Render Layers → Pixelate → Composite
+# Render Layers → File Output (raw image)
+# so a single render writes both images.
+# Nodes are named, so a graph left by an earlier batch
+# is found again and only its settings are updated.
 # Pixel size is fixed at intensity 5.
 # ========================================================
-def setup_compositor(pixel_size=5):
-    scene = bpy.context.scene
-    scene.use_nodes = True
-    tree = scene.node_tree
+COMPOSITOR_LINKS = {
+    ("RenderTools Layers", "RenderTools Pixelate"),
+    ("RenderTools Pixelate", "RenderTools Composite"),
+    ("RenderTools Layers", "RenderTools Raw"),
+}
+
+def build_compositor(tree):
     nodes = tree.nodes
     links = tree.links
 
@@ -50,25 +124,698 @@ def setup_compositor(pixel_size=5):
     render_node = nodes.new("CompositorNodeRLayers")
     pixel_node = nodes.new("CompositorNodePixelate")
     composite_node = nodes.new("CompositorNodeComposite")
+    raw_node = nodes.new("CompositorNodeOutputFile")
 
-    pixel_node.size_x = pixel_size
-    pixel_node.size_y = pixel_size
+    render_node.name = "RenderTools Layers"
+    pixel_node.name = "RenderTools Pixelate"
+    composite_node.name = "RenderTools Composite"
+    raw_node.name = "RenderTools Raw"
 
     render_node.location = (-300, 0)
     pixel_node.location = (0, 0)
     composite_node.location = (300, 0)
+    raw_node.location = (300, -200)
 
     links.new(render_node.outputs["Image"], pixel_node.inputs["Image"])
     links.new(pixel_node.outputs["Image"], composite_node.inputs["Image"])
+    links.new(render_node.outputs["Image"], raw_node.inputs[0])
+
+def setup_compositor(output_dir, base_name, pixel_size=5):
+    scene = bpy.context.scene
+    scene.use_nodes = True
+    tree = scene.node_tree
+
+    current = {(l.from_node.name, l.to_node.name) for l in tree.links}
+    if current != COMPOSITOR_LINKS or len(tree.nodes) != 4:
+        build_compositor(tree)
+
+    pixel_node = tree.nodes["RenderTools Pixelate"]
+    raw_node = tree.nodes["RenderTools Raw"]
+
+    pixel_node.size_x = pixel_size
+    pixel_node.size_y = pixel_size
+
+    # "#" is replaced by the frame number, which is the image
+    # counter while the rotations render (see render_jobs)
+    raw_node.base_path = output_dir
+    raw_node.format.file_format = "PNG"
+    raw_node.file_slots[0].path = f"{base_name}_#"
+
+    # Same level as the composite; render_jobs drops both to 0
+    # while it deflates the images itself
+    raw_node.format.compression = scene.render.image_settings.compression
+
+# ========================================================
+# PNG RECOMPRESSION
+# --------------------------------------------------------
+# Renders are saved as uncompressed PNGs so the render
+# loop never waits on zlib. Afterwards the image data is
+# deflated again in place; no pixels are decoded.
+# Headless workers skip this and save compressed.
+# ========================================================
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+def _png_chunk(kind, body):
+    crc = zlib.crc32(kind + body)
+    return struct.pack(">I", len(body)) + kind + body + struct.pack(">I", crc)
+
+def compress_png(path, level):
+    with open(path, "rb") as f:
+        data = f.read()
+
+    chunks = []
+    idat = []
+    pos = len(PNG_SIGNATURE)
+    while pos < len(data):
+        length, kind = struct.unpack(">I4s", data[pos:pos + 8])
+        body = data[pos + 8:pos + 8 + length]
+        pos += length + 12
+
+        if kind == b"IDAT":
+            # All IDAT chunks are merged into the first one's slot
+            if not idat:
+                chunks.append(None)
+            idat.append(body)
+        else:
+            chunks.append(_png_chunk(kind, body))
+
+    pixels = zlib.compress(zlib.decompress(b"".join(idat)), level)
+    chunks[chunks.index(None)] = _png_chunk(b"IDAT", pixels)
+
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(PNG_SIGNATURE + b"".join(chunks))
+    os.replace(tmp_path, path)
+
+# ========================================================
+# RENDER JOBS
+# --------------------------------------------------------
+# A job is (frame, rotation index, counter).
+#
+# All jobs are baked onto one synthetic timeline: a
+# temporary action on the object keys, at frame
+# `counter`, every channel of its action sampled at the
+# job's keyframe plus the swept rotation. The batch is
+# then a plain animation render whose "#" frame
+# substitution names every file, rendered in this
+# process or as -s/-e spans by headless workers.
+# The timeline only carries the object's own action, so
+# when anything else in the scene is animated or follows
+# the frame (caches, Scene Time, image sequences), or
+# motion blur would smear neighbouring counters together,
+# the batch falls back to one still per job at its keyframe.
+# ========================================================
+ROTATION_CHANNELS = {
+    "QUATERNION": ("rotation_quaternion", (0, 1, 2, 3)),
+    "AXIS_ANGLE": ("rotation_axis_angle", (0, 1, 2, 3)),
+}
+EULER_CHANNEL = ("rotation_euler", (2,))
+
+def iter_keyframes(action):
+    # foreach_get copies the (frame, value) pairs of every
+    # keyframe point into one flat buffer in a single call.
+    # Keyframe points are kept sorted, so the per-fcurve
+    # frames are merged into one sorted, duplicate-free stream
+    streams = []
+    for fcurve in action.fcurves:
+        buf = np.empty(2 * len(fcurve.keyframe_points), dtype=np.float32)
+        fcurve.keyframe_points.foreach_get("co", buf)
+        streams.append(buf[0::2].astype(np.int32).tolist())
+
+    prev = None
+    for frame in heapq.merge(*streams):
+        if frame != prev:
+            yield frame
+            prev = frame
+
+def build_jobs(keyframes, steps):
+    jobs = []
+    counter = 1
+    for frame in keyframes:
+        for i in range(steps):
+            jobs.append((frame, i, counter))
+            counter += 1
+    return jobs
+
+@lru_cache(maxsize=None)
+def rotation_angles(step_angle):
+    return tuple(math.radians(i * step_angle) for i in range(360 // step_angle))
+
+def sweep_rotations(mode, rotation, angles):
+    # Each rotation sets the Z angle on top of the keyframe's X/Y
+    # rotation, as a (rotation, channel) array in the object's own
+    # rotation mode, so quaternion and axis-angle objects turn as
+    # well instead of ignoring rotation_euler
+    if mode == "QUATERNION":
+        base = Quaternion(rotation).to_euler("XYZ")
+    elif mode == "AXIS_ANGLE":
+        angle, *axis = rotation
+        base = Quaternion(axis, angle).to_euler("XYZ")
+    else:
+        return np.array(angles, dtype=np.float32)[:, None]
+
+    quats = [Euler((base.x, base.y, a), "XYZ").to_quaternion() for a in angles]
+    if mode == "QUATERNION":
+        return np.array(quats, dtype=np.float32)
+
+    rows = []
+    for q in quats:
+        axis, angle = q.to_axis_angle()
+        rows.append((angle, *axis))
+    return np.array(rows, dtype=np.float32)
+
+def is_muted(fcurve):
+    # frame_set ignores muted curves and curves in muted groups
+    return fcurve.mute or bool(fcurve.group and fcurve.group.mute)
+
+def key_channel(action, data_path, index, frames, values):
+    # (frame, value) pairs for all points, filled column-wise
+    co = np.empty((len(frames), 2), dtype=np.float32)
+    co[:, 0] = frames
+    co[:, 1] = values
+
+    fcurve = action.fcurves.new(data_path, index=index)
+    points = fcurve.keyframe_points
+    points.add(len(co))
+    points.foreach_set("co", co.ravel())
+    for point in points:
+        point.interpolation = "CONSTANT"
+    fcurve.update()
+
+def _sorted_points(points, tolerance=1e-4):
+    grid = np.round(points / tolerance)
+    return grid[np.lexsort(grid.T[::-1])]
+
+TRANSFORM_PATHS = {
+    "location", "rotation_euler", "rotation_quaternion",
+    "rotation_axis_angle", "scale",
+}
+
+def symmetry_period(obj, source, angles):
+    # Smallest number of rotation steps after which the evaluated
+    # mesh maps onto itself around its local Z axis. Rotated vertex
+    # sets are compared on a grid; near-misses only ever lose the
+    # shortcut, they never fake it.
+    # The mesh is measured once, at the current frame, which holds
+    # for every keyframe only while the keys move the object and
+    # never reshape it (modifiers, delta transforms, ...)
+    steps = len(angles)
+    if obj.type != "MESH" or obj.children:
+        return steps
+    if any(
+        fc.data_path not in TRANSFORM_PATHS
+        for fc in source.fcurves
+        if not is_muted(fc)
+    ):
+        return steps
+
+    depsgraph = bpy.context.evaluated_depsgraph_get()
+    vertices = obj.evaluated_get(depsgraph).data.vertices
+    verts = np.empty(3 * len(vertices), dtype=np.float64)
+    vertices.foreach_get("co", verts)
+    verts = verts.reshape(-1, 3)
+    reference = _sorted_points(verts)
+
+    for period in range(1, steps):
+        c, s = math.cos(angles[period]), math.sin(angles[period])
+        turned = verts @ np.array([[c, s, 0], [-s, c, 0], [0, 0, 1]])
+        if np.allclose(_sorted_points(turned), reference, rtol=0, atol=1):
+            return period
+    return steps
+
+def is_upright(obj, source, frame):
+    # A mesh's Z symmetry only shows in the render when the sweep
+    # is a pure turn: no X/Y tilt and equal X/Y scale, delta
+    # scale included
+    def value(data_path, index):
+        fcurve = source.fcurves.find(data_path, index=index)
+        if fcurve and not is_muted(fcurve):
+            return fcurve.evaluate(frame)
+        return getattr(obj, data_path)[index]
+
+    mode = obj.rotation_mode
+    if mode == "QUATERNION":
+        q = Quaternion([value("rotation_quaternion", k) for k in range(4)])
+        tilt = q.to_euler("XYZ")
+    elif mode == "AXIS_ANGLE":
+        angle, *axis = [value("rotation_axis_angle", k) for k in range(4)]
+        tilt = Quaternion(axis, angle).to_euler("XYZ")
+    else:
+        tilt = (value("rotation_euler", 0), value("rotation_euler", 1))
+
+    scale_x = value("scale", 0) * value("delta_scale", 0)
+    scale_y = value("scale", 1) * value("delta_scale", 1)
+    return (
+        abs(tilt[0]) < 1e-6
+        and abs(tilt[1]) < 1e-6
+        and math.isclose(scale_x, scale_y)
+    )
+
+def bake_sweep(sweep, source, obj, jobs, angles, reuse=False, symmetric=False):
+    data_path, indices = ROTATION_CHANNELS.get(obj.rotation_mode, EULER_CHANNEL)
+    current = tuple(getattr(obj, data_path))
+
+    rotation_curves = {}
+    curves = []
+    for fcurve in source.fcurves:
+        if is_muted(fcurve):
+            continue
+        if fcurve.data_path == data_path and fcurve.array_index in indices:
+            rotation_curves[fcurve.array_index] = fcurve
+        else:
+            curves.append(fcurve)
+
+    todo = []
+    poses = []
+    rotations = []
+
+    # pose -> {rotation index: counter already baked}
+    baked = {}
+    copies = []
+    period = symmetry_period(obj, source, angles) if symmetric else len(angles)
+
+    for frame, block in groupby(jobs, key=lambda job: job[0]):
+        block = list(block)
+
+        # fcurve.evaluate samples the keyframe without a frame_set
+        # and the depsgraph update that comes with it
+        pose = tuple(fc.evaluate(frame) for fc in curves)
+        rotation = tuple(
+            rotation_curves[k].evaluate(frame) if k in rotation_curves else v
+            for k, v in enumerate(current)
+        )
+
+        if reuse:
+            seen = baked.setdefault(pose + rotation, {})
+            if all(i in seen for _, i, _ in block):
+                copies.extend((seen[i], counter) for _, i, counter in block)
+                continue
+            seen.update((i, counter) for _, i, counter in block)
+
+        # Turn i renders like turn i % period, so only the first
+        # period of the sweep is rendered
+        if period < len(angles) and is_upright(obj, source, frame):
+            copies.extend(
+                (counter - (i - i % period), counter)
+                for _, i, counter in block
+                if i >= period
+            )
+            block = [job for job in block if job[1] < period]
+
+        rows = sweep_rotations(obj.rotation_mode, rotation, angles)
+        poses.append(np.repeat([pose], len(block), axis=0))
+        rotations.append(rows[[i for _, i, _ in block]])
+        todo.extend(block)
+
+    if todo:
+        frames = np.array([counter for _, _, counter in todo], dtype=np.float32)
+        poses = np.concatenate(poses)
+        rotations = np.concatenate(rotations)
+
+        for column, fc in enumerate(curves):
+            key_channel(sweep, fc.data_path, fc.array_index, frames, poses[:, column])
+        for column, index in enumerate(indices):
+            key_channel(sweep, data_path, index, frames, rotations[:, column])
+
+    return todo, copies
+
+def _is_animated(id_data):
+    anim = getattr(id_data, "animation_data", None)
+    return bool(anim and (anim.action or anim.drivers or anim.nla_tracks))
+
+def animated_elsewhere(scene, obj):
+    # Anything keyed or driven besides obj's own action would play
+    # at the counter frames of the baked timeline: other objects
+    # (parents and the camera included), object data, shape keys,
+    # materials, the world and the scene itself
+    anim = obj.animation_data
+    if anim.drivers or anim.nla_tracks:
+        return True
+
+    ids = [scene, scene.node_tree, scene.world]
+    if scene.world:
+        ids.append(scene.world.node_tree)
+    for ob in scene.objects:
+        if ob is not obj:
+            ids.append(ob)
+        ids.append(ob.data)
+        ids.append(getattr(ob.data, "shape_keys", None))
+        for slot in ob.material_slots:
+            if slot.material:
+                ids += [slot.material, slot.material.node_tree]
+    return any(_is_animated(id_data) for id_data in ids)
+
+# Modifiers whose result follows the current frame without any keys:
+# point caches and simulations, plus frame-driven deformers
+TIME_MODIFIERS = {
+    "CLOTH", "SOFT_BODY", "FLUID", "DYNAMIC_PAINT", "PARTICLE_SYSTEM",
+    "EXPLODE", "WAVE", "BUILD", "MESH_CACHE", "MESH_SEQUENCE_CACHE",
+}
+
+def _uses_time(tree):
+    # Scene Time nodes and image sequence or movie textures, also
+    # inside node groups
+    for node in tree.nodes:
+        if node.bl_idname == "GeometryNodeInputSceneTime":
+            return True
+        image = getattr(node, "image", None)
+        if image and image.source in {"SEQUENCE", "MOVIE"}:
+            return True
+        if node.type == "GROUP" and node.node_tree and _uses_time(node.node_tree):
+            return True
+    return False
+
+def time_dependent(scene):
+    # Unkeyed state that still changes with the frame would be
+    # evaluated at the counter frames as well
+    if scene.rigidbody_world:
+        return True
+
+    trees = []
+    if scene.world and scene.world.node_tree:
+        trees.append(scene.world.node_tree)
+    for ob in scene.objects:
+        for modifier in ob.modifiers:
+            if modifier.type in TIME_MODIFIERS:
+                return True
+            if modifier.type == "NODES" and modifier.node_group:
+                trees.append(modifier.node_group)
+        for slot in ob.material_slots:
+            if slot.material and slot.material.node_tree:
+                trees.append(slot.material.node_tree)
+    return any(_uses_time(tree) for tree in trees)
+
+def motion_blurred(scene):
+    # Consecutive counter frames hold different turns, so a shutter
+    # spanning them would ghost the previous turn into each sprite
+    render = scene.render
+    if render.engine == "BLENDER_WORKBENCH":
+        return False
+    return render.use_motion_blur or getattr(scene.eevee, "use_motion_blur", False)
+
+def frame_spans(counters):
+    # Runs of consecutive counters as [start, end] frame ranges
+    spans = []
+    for counter in counters:
+        if spans and spans[-1][1] == counter - 1:
+            spans[-1][1] = counter
+        else:
+            spans.append([counter, counter])
+    return spans
+
+def frame_file(template, frame, ext=".png"):
+    # Blender swaps the last "#" of an output path for the frame
+    # number (a single "#" pads to no width) and adds the extension
+    head, _, tail = template.rpartition("#")
+    return f"{head}{frame}{tail}{ext}"
+
+def remove_file(path):
+    if os.path.exists(path):
+        os.remove(path)
+
+def check_written(paths):
+    # Esc aborts a render but the operator still returns FINISHED,
+    # so a cancel only shows as images that were never written
+    if not all(os.path.exists(path) for path in paths):
+        raise RuntimeError("Render cancelled")
+
+def copy_file(src, dst):
+    # A real copy: Blender writes over existing files in place, so
+    # a hard link would let a later batch rewrite both names
+    remove_file(dst)
+    shutil.copyfile(src, dst)
+
+def enter_batch_settings(stack, scene, filepath, preview=False):
+    render = scene.render
+
+    # Quick look at a rotation sweep: Workbench, quarter size
+    if preview:
+        stack.enter_context(override_attrs(
+            render, engine="BLENDER_WORKBENCH", resolution_percentage=25
+        ))
+
+    # Lock the UI and hide viewport overlays so nothing redraws
+    # between renders. Animation renders skip frames whose file
+    # exists unless overwriting, so always overwrite like write_still
+    stack.enter_context(override_attrs(
+        render,
+        use_lock_interface=True,
+        filepath=filepath,
+        use_file_extension=True,
+        use_overwrite=True,
+        use_placeholder=False,
+    ))
+    for overlay in viewport_overlays():
+        stack.enter_context(override_attrs(overlay, show_overlays=False))
+
+    stack.enter_context(override_attrs(render.image_settings, file_format="PNG"))
+
+    # Cycles keeps the converted scene between renders, so each
+    # span or still after the first only syncs what changed since
+    # the last one instead of rebuilding the whole scene
+    if render.engine == "CYCLES":
+        stack.enter_context(override_attrs(render, use_persistent_data=True))
+
+        # Sprites are pixelated afterwards, so cap samples and let
+        # adaptive sampling and the denoiser do the rest
+        cycles = scene.cycles
+        stack.enter_context(override_attrs(
+            cycles,
+            use_adaptive_sampling=True,
+            adaptive_threshold=0.01,
+            samples=min(cycles.samples, 128),
+            use_denoising=True,
+            use_auto_tile=True,
+            tile_size=2048,
+        ))
+    elif render.engine in {"BLENDER_EEVEE", "BLENDER_EEVEE_NEXT"}:
+        eevee = scene.eevee
+        stack.enter_context(override_attrs(
+            eevee, taa_render_samples=min(eevee.taa_render_samples, 16)
+        ))
+
+    # Frame range is rewritten per span, restored after
+    stack.enter_context(override_attrs(
+        scene,
+        frame_start=scene.frame_start,
+        frame_end=scene.frame_end,
+        frame_step=1,
+    ))
+    stack.callback(scene.frame_set, scene.frame_current)
+
+def enter_deferred_compression(stack, scene):
+    # Save uncompressed, compress afterwards using the level the
+    # user picked (Blender maps 0-100% to zlib 0-9 the same way)
+    level = int(scene.render.image_settings.compression / 11.1111)
+    raw_node = scene.node_tree.nodes["RenderTools Raw"]
+    stack.enter_context(override_attrs(scene.render.image_settings, compression=0))
+    stack.enter_context(override_attrs(raw_node.format, compression=0))
+    return level
+
+def render_spans(scene, spans, num_workers, templates):
+    # Yields the counters of each span once its images are written
+    if num_workers > 1 and spans:
+        run_workers(split_spans(spans, num_workers))
+
+    for start, end in spans:
+        # One render writes both images: the composite goes to
+        # render.filepath, the File Output node saves the raw one
+        if num_workers == 1:
+            scene.frame_start = start
+            scene.frame_end = end
+            bpy.ops.render.render(animation=True)
+
+        counters = range(start, end + 1)
+        check_written(frame_file(t, c) for t in templates for c in counters)
+        yield from counters
+
+def render_stills(scene, obj, jobs, angles, raw_path, post_path, still_path):
+    # Fallback for scenes animated beyond obj's action: frame_set
+    # poses everything at the keyframe, then each turn is written
+    # as a still. The File Output node names its image after the
+    # keyframe, so it is moved to the counter name afterwards.
+    # Always renders in this process
+    data_path, indices = ROTATION_CHANNELS.get(obj.rotation_mode, EULER_CHANNEL)
+    channels = getattr(obj, data_path)
+
+    for frame, block in groupby(jobs, key=lambda job: job[0]):
+        scene.frame_set(frame)
+        rows = sweep_rotations(obj.rotation_mode, tuple(channels), angles)
+
+        for _, i, counter in block:
+            for column, index in enumerate(indices):
+                channels[index] = rows[i, column]
+
+            # A still left by an aborted batch must not pass as written
+            remove_file(frame_file(still_path, frame))
+            scene.render.filepath = frame_file(post_path, counter, ext="")
+            bpy.ops.render.render(write_still=True)
+            check_written([frame_file(still_path, frame), frame_file(post_path, counter)])
+            os.replace(frame_file(still_path, frame), frame_file(raw_path, counter))
+            yield counter
+
+def render_jobs(scene, obj, jobs, settings):
+    # Resolve everything the batch needs once, up front
+    angles = rotation_angles(settings["step_angle"])
+
+    # Output paths are set once as "#" templates; Blender fills in
+    # the frame (= counter) itself, nothing is formatted per image
+    raw_path = settings["output_path"] + settings["base_name"] + "_#"
+    post_path = settings["post_output_path"] + settings["base_name"] + "_#_pixel"
+    num_workers = settings["num_workers"]
+    anim = obj.animation_data
+    source_action = anim.action
+    data_path, _ = ROTATION_CHANNELS.get(obj.rotation_mode, EULER_CHANNEL)
+    futures = []
+
+    # The stack is unwound before the pool waits on its tasks
+    with ThreadPoolExecutor(max_workers=4) as executor, ExitStack() as stack:
+        enter_batch_settings(
+            stack, scene, post_path,
+            preview=settings["preview_mode"],
+        )
+
+        # Both paths write the swept rotation; channels the source
+        # action does not key would otherwise stay turned
+        stack.callback(setattr, obj, data_path, tuple(getattr(obj, data_path)))
+
+        stills = (
+            motion_blurred(scene)
+            or animated_elsewhere(scene, obj)
+            or time_dependent(scene)
+        )
+
+        # Workers save at the user's level themselves, in parallel;
+        # this process only pays for zlib when it renders
+        level = 0
+        if stills or num_workers == 1:
+            level = enter_deferred_compression(stack, scene)
+
+        if stills:
+            # Raw stills are written under a "still_" name first so
+            # keyframe-numbered files never clobber counter ones
+            raw_slot = scene.node_tree.nodes["RenderTools Raw"].file_slots[0]
+            still_path = settings["output_path"] + "still_" + raw_slot.path
+            stack.enter_context(override_attrs(raw_slot, path="still_" + raw_slot.path))
+
+            # No pose is shared when the rest of the scene moves
+            todo, copies = jobs, []
+            counters = render_stills(
+                scene, obj, jobs, angles, raw_path, post_path, still_path
+            )
+        else:
+            sweep = bpy.data.actions.new("RenderTools_Sweep")
+            stack.callback(bpy.data.actions.remove, sweep)
+            stack.callback(setattr, anim, "action", source_action)
+
+            todo, copies = bake_sweep(
+                sweep, source_action, obj, jobs, angles,
+                reuse=settings["reuse_identical"],
+                symmetric=settings["reuse_symmetric"],
+            )
+            anim.action = sweep
+
+            # At most one span per keyframe block, so the pool deflates
+            # a block while the next one renders
+            spans = [
+                span
+                for _, block in groupby(todo, key=lambda job: job[0])
+                for span in frame_spans(counter for _, _, counter in block)
+            ]
+            counters = render_spans(scene, spans, num_workers, (raw_path, post_path))
+
+        # Files left by an earlier batch may still be hard links
+        # into other images; drop them so nothing is written through
+        for _, _, counter in todo:
+            remove_file(frame_file(raw_path, counter))
+            remove_file(frame_file(post_path, counter))
+
+        # zlib releases the GIL, so deflating finished images on the
+        # pool overlaps the next render
+        for counter in counters:
+            # Level 0: stored as wanted, or saved compressed by workers
+            if level:
+                futures.extend(
+                    executor.submit(compress_png, frame_file(path, counter), level)
+                    for path in (raw_path, post_path)
+                )
+
+    # Surface any compression error
+    for future in futures:
+        future.result()
+
+    # Copy only after compression replaced the source files
+    for src, dst in copies:
+        copy_file(frame_file(raw_path, src), frame_file(raw_path, dst))
+        copy_file(frame_file(post_path, src), frame_file(post_path, dst))
+
+    return len(todo), len(copies)
+
+# ========================================================
+# RENDER WORKERS
+# --------------------------------------------------------
+# Saves a copy of the current file with the sweep baked
+# in, splits the frame spans into even groups and renders
+# each group natively (-s/-e/-a) in its own `blender -b`
+# process pinned to one GPU.
+# ========================================================
+def split_spans(spans, count):
+    total = sum(end - start + 1 for start, end in spans)
+    size = math.ceil(total / count)
+
+    groups = []
+    group = []
+    room = size
+    for start, end in spans:
+        while start <= end:
+            stop = min(end, start + room - 1)
+            group.append((start, stop))
+            room -= stop - start + 1
+            start = stop + 1
+            if room == 0:
+                groups.append(group)
+                group = []
+                room = size
+    if group:
+        groups.append(group)
+    return groups
+
+def _run_worker_process(command):
+    gpu_index, args = command
+    env = dict(os.environ, CUDA_VISIBLE_DEVICES=str(gpu_index))
+    return subprocess.Popen(args, env=env).wait()
+
+def run_workers(span_groups):
+    tmp_dir = tempfile.mkdtemp(prefix="render_tools_")
+    try:
+        blend_path = os.path.join(tmp_dir, "scene.blend")
+        bpy.ops.wm.save_as_mainfile(filepath=blend_path, copy=True)
+
+        commands = []
+        for idx, spans in enumerate(span_groups):
+            args = [bpy.app.binary_path, "-noaudio", "-b", blend_path]
+            for start, end in spans:
+                args += ["-s", str(start), "-e", str(end), "-a"]
+            commands.append((idx, args))
+
+        with ThreadPool(len(commands)) as pool:
+            codes = pool.map(_run_worker_process, commands)
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    if any(codes):
+        raise RuntimeError("A render worker failed, see console")
 
 # ========================================================
 # OPERATOR: RENDER + COMPOSITE
 # --------------------------------------------------------
 # For each keyframe:
 # - Rotate object in fixed steps
-# - Render image
+# - Bake the rotations onto one animation and render it
 # - Apply compositor pixelation
 # - Save final output to post folder
+# With more than one worker the animation is split over
+# background Blender processes instead.
 # ========================================================
 class OBJECT_OT_render_rotations(bpy.types.Operator):
     bl_idname = "object.render_rotations"
@@ -85,51 +832,46 @@ class OBJECT_OT_render_rotations(bpy.types.Operator):
             return {"CANCELLED"}
 
         # Ensure output folders exist
-        os.makedirs(bpy.path.abspath(props.output_path), exist_ok=True)
-        os.makedirs(bpy.path.abspath(props.post_output_path), exist_ok=True)
+        output_dir = bpy.path.abspath(props.output_path)
+        post_dir = bpy.path.abspath(props.post_output_path)
+        os.makedirs(output_dir, exist_ok=True)
+        os.makedirs(post_dir, exist_ok=True)
 
         # Setup compositor once
-        setup_compositor(pixel_size=5)
+        setup_compositor(output_dir, props.base_name, pixel_size=5)
 
         # --------------------------------------------
         # Collect keyframes
         # --------------------------------------------
-        keyframes = set()
+        keyframes = ()
         if obj.animation_data and obj.animation_data.action:
-            for fcurve in obj.animation_data.action.fcurves:
-                for kp in fcurve.keyframe_points:
-                    keyframes.add(int(kp.co[0]))
+            keyframes = iter_keyframes(obj.animation_data.action)
 
-        if not keyframes:
+        jobs = build_jobs(keyframes, 360 // props.step_angle)
+        if not jobs:
             self.report({"ERROR"}, "No keyframes found")
             return {"CANCELLED"}
 
-        counter = 1
-        steps = int(360 / props.step_angle)
-
-        for frame in sorted(keyframes):
-            scene.frame_set(frame)
-
-            for i in range(steps):
-                obj.rotation_euler[2] = math.radians(i * props.step_angle)
-
-                # Raw render output (temporary)
-                raw_path = f"{props.output_path}{props.base_name}_{counter}.png"
-                scene.render.filepath = raw_path
-
-                bpy.ops.render.render(write_still=True)
-
-                # Composited output
-                post_path = (
-                    f"{props.post_output_path}"
-                    f"{props.base_name}_{counter}_pixel.png"
-                )
-                scene.render.filepath = post_path
-
-                # Write compositor result
-                bpy.ops.render.render(write_still=True)
+        # Absolute paths so workers resolve them the same way
+        settings = {
+            "step_angle": props.step_angle,
+            "output_path": output_dir,
+            "post_output_path": post_dir,
+            "base_name": props.base_name,
+            "num_workers": props.num_workers,
+            "preview_mode": props.preview_mode,
+            "reuse_identical": props.reuse_identical,
+            "reuse_symmetric": props.reuse_symmetric,
+        }
+
+        try:
+            rendered, copied = render_jobs(scene, obj, jobs, settings)
+        except (RuntimeError, OSError) as err:
+            self.report({"ERROR"}, str(err))
+            return {"CANCELLED"}
 
-                counter += 1
+        # One summary instead of a report (and info redraw) per image
+        self.report({"INFO"}, f"Rendered {rendered} images, copied {copied}")
 
         return {"FINISHED"}
 
@@ -142,16 +884,20 @@ class OBJECT_OT_clean_and_merge(bpy.types.Operator):
     bl_options = {"REGISTER", "UNDO"}
 
     def execute(self, context):
-        bpy.ops.object.select_all(action='DESELECT')
-        for obj in bpy.data.objects:
-            if obj.type == 'EMPTY':
-                obj.select_set(True)
-        bpy.ops.object.delete()
-
         meshes = [o for o in context.selected_objects if o.type == 'MESH']
+
+        # Remove through the data API: no selection changes and no
+        # operator/undo overhead per empty
+        for obj in [o for o in bpy.data.objects if o.type == 'EMPTY']:
+            bpy.data.objects.remove(obj, do_unlink=True)
+
         if len(meshes) > 1:
-            context.view_layer.objects.active = meshes[0]
-            bpy.ops.object.join()
+            with context.temp_override(
+                active_object=meshes[0],
+                selected_objects=meshes,
+                selected_editable_objects=meshes,
+            ):
+                bpy.ops.object.join()
 
         return {"FINISHED"}
 
@@ -195,6 +941,10 @@ class VIEW3D_PT_render_tools(bpy.types.Panel):
         layout.prop(props, "output_path")
         layout.prop(props, "post_output_path")
         layout.prop(props, "step_angle")
+        layout.prop(props, "num_workers")
+        layout.prop(props, "preview_mode")
+        layout.prop(props, "reuse_identical")
+        layout.prop(props, "reuse_symmetric")
 
         layout.separator()
         layout.operator("object.render_rotations", icon="RENDER_STILL")